@@ -16,11 +16,11 @@ from langchain.agents.middleware import dynamic_prompt, ModelRequest
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import MarkdownHeaderTextSplitter
 from langchain_pinecone import PineconeVectorStore
-from langchain_tavily import TavilySearch
 from pinecone import Pinecone, ServerlessSpec
 from langgraph.checkpoint.memory import InMemorySaver
 
 from prompts import system_prompt, voice_system_prompt
+from web_search import setup_web_search, search
 
 load_dotenv()
 
@@ -31,7 +31,6 @@ index_name = os.getenv("PINECONE_INDEX_NAME")
 _pc_index = None
 _vector_store = None
 _filter_llm = None
-_web_search = None
 
 # ---------------------------------------------------------------------------
 # Pinecone + vector store init
@@ -39,7 +38,7 @@ _web_search = None
 
 
 def setup_vector_store():
-    global _pc_index, _vector_store, _filter_llm, _web_search
+    global _pc_index, _vector_store, _filter_llm
 
     pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
     if not pc.has_index(index_name):
@@ -56,7 +55,7 @@ def setup_vector_store():
         index=_pc_index, embedding=embeddings, namespace="aayush-docs"
     )
     _filter_llm = init_chat_model("o3-mini").with_structured_output(Filter)
-    _web_search = TavilySearch(max_results=2)
+    setup_web_search()
 
 
 # ---------------------------------------------------------------------------
@@ -215,8 +214,7 @@ def web_search_tool(query: str) -> str:
     Input: query (str) - the search term.
     Output: short text with titles and urls of results.
     """
-    res = _web_search.invoke({"query": query})
-    return res["results"]
+    return search(query)
 
 
 @tool
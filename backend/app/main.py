@@ -1,20 +1,23 @@
 import os
 import json
 import uuid
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Depends, WebSocket, WebSocketDisconnect
 from fastapi.responses import RedirectResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_core.messages import AIMessageChunk
 from models import ChatRequest
 from agent import build_agent, query_rag
 from logger import get_logger
-from voice.stt import transcribe, load_whisper_model
+from voice.stt import transcribe, load_whisper_model, StreamingTranscriber
 from voice.tts import synthesize, AUDIO_DIR
 from security import require_api_key
 
 logger = get_logger(__name__)
 
+ALLOWED_ORIGINS = ["https://aayushmaan-bot.vercel.app", "http://localhost:5173", "https://aayushbot.myddns.me"]
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up — building agent...")
@@ -29,7 +32,7 @@ app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["https://aayushmaan-bot.vercel.app", "http://localhost:5173", "https://aayushbot.myddns.me"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -102,6 +105,73 @@ async def voice_chat(audio: UploadFile = File(...)):
     return {"question": question, "reply": reply, "audio_url": f"/audio/{audio_filename}"}
 
 
+@app.websocket("/ws/voice-chat")
+async def voice_chat_stream(ws: WebSocket):
+    """Streaming voice input.
+
+    Client sends binary frames of 16 kHz mono 16-bit PCM, and may send the
+    text frame "end" to force end of utterance. Server replies with JSON:
+    {"type": "partial"}, {"type": "final"}, {"type": "token"}, {"type": "reply"},
+    or {"type": "error"} after which the socket stays open for the next utterance.
+    """
+    # CORS middleware does not cover WebSocket handshakes
+    if ws.headers.get("origin") not in ALLOWED_ORIGINS:
+        await ws.close(code=1008)
+        return
+
+    await ws.accept()
+    agent = app.state.agent
+    config = {"configurable": {"thread_id": f"voice_{uuid.uuid4().hex[:8]}"}}
+    transcriber = StreamingTranscriber()
+
+    try:
+        while True:
+            frame = await ws.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+
+            if frame.get("bytes"):
+                for piece in await asyncio.to_thread(transcriber.feed, frame["bytes"]):
+                    await ws.send_json({"type": "partial", "text": piece})
+            if not transcriber.ended and frame.get("text") != "end":
+                continue
+
+            question = await asyncio.to_thread(transcriber.finish)
+            transcriber = StreamingTranscriber()
+            if not question:
+                await ws.send_json({"type": "error", "detail": "Could not transcribe audio. Try again."})
+                continue
+            await ws.send_json({"type": "final", "text": question})
+
+            try:
+                reply = ""
+                async for msg, metadata in agent.astream(
+                    {"messages": [{"role": "user", "content": question}]},
+                    config=config,
+                    context={"is_voice": True},
+                    stream_mode="messages",
+                ):
+                    if isinstance(msg, AIMessageChunk) and msg.content and not msg.tool_calls:
+                        reply += msg.content
+                        await ws.send_json({"type": "token", "token": msg.content})
+
+                audio_path = await synthesize(reply)
+                audio_filename = os.path.basename(audio_path)
+                await ws.send_json({"type": "reply", "reply": reply, "audio_url": f"/audio/{audio_filename}"})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Voice stream reply failed: {e}")
+                try:
+                    await ws.send_json({"type": "error", "detail": "Something went wrong. Try again."})
+                except Exception:
+                    # Client is already gone
+                    break
+    except WebSocketDisconnect:
+        pass
+    logger.info("Voice stream closed")
+
+
 @app.get("/audio/{filename}")
 def get_audio(filename: str):
     filepath = os.path.join(AUDIO_DIR, filename)
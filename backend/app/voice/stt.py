@@ -1,10 +1,28 @@
 from functools import lru_cache
+from typing import Optional
+
+import numpy as np
 from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 
 WHISPER_MODEL = "base"
 WHISPER_DEVICE = "cpu"
 WHISPER_COMPUTE_TYPE = "int8"
 
+# Streaming input: raw 16 kHz mono 16-bit PCM frames
+SAMPLE_RATE = 16000
+VAD_STEP_MS = 300             # re-run VAD after this much new audio
+SEGMENT_SILENCE_MS = 400      # silence that closes a speech segment
+END_OF_UTTERANCE_MS = 800     # trailing silence that ends the utterance
+MAX_SEGMENT_S = 30            # VAD splits longer speech so pending audio stays bounded
+MAX_UTTERANCE_S = 60          # hard cap on one streamed utterance
+STREAM_LANGUAGE = "en"        # short segments are too brief for reliable language detection
+VAD_OPTIONS = VadOptions(
+    min_silence_duration_ms=SEGMENT_SILENCE_MS,
+    speech_pad_ms=200,
+    max_speech_duration_s=MAX_SEGMENT_S,
+)
+
 
 @lru_cache(maxsize=1)
 def load_whisper_model() -> WhisperModel:
@@ -25,3 +43,97 @@ def transcribe(file_path: str) -> str:
     segments, _ = model.transcribe(file_path, beam_size=5, vad_filter=True)
     text = " ".join([seg.text for seg in segments]).strip()
     return text
+
+
+def transcribe_array(audio: np.ndarray, vad_filter: bool = False, initial_prompt: Optional[str] = None) -> str:
+    """Transcribe in-memory float32 16 kHz audio to text."""
+    model = load_whisper_model()
+    segments, _ = model.transcribe(
+        audio,
+        language=STREAM_LANGUAGE,
+        beam_size=5,
+        vad_filter=vad_filter,
+        initial_prompt=initial_prompt or None,
+    )
+    return " ".join([seg.text for seg in segments]).strip()
+
+
+def _ms_to_samples(ms: int) -> int:
+    return SAMPLE_RATE * ms // 1000
+
+
+class StreamingTranscriber:
+    """Incremental, VAD-segmented transcription of a live PCM stream.
+
+    Audio is held in memory only. Each time a speech segment is closed by
+    silence it is decoded right away, so by the time the speaker stops most
+    of the utterance is already transcribed.
+    """
+
+    def __init__(self):
+        self._pending = np.zeros(0, dtype=np.float32)  # audio not yet decoded
+        self._carry = b""                               # odd trailing byte of the last frame
+        self._since_vad = 0
+        self._total = 0                                  # samples since speech could have started
+        self._parts: list[str] = []
+        self.ended = False
+
+    @property
+    def text(self) -> str:
+        return " ".join(self._parts).strip()
+
+    def feed(self, pcm: bytes) -> list[str]:
+        """Add a PCM frame. Returns any newly decoded text pieces."""
+        if self.ended:
+            return []
+        pcm = self._carry + pcm
+        usable = len(pcm) - len(pcm) % 2
+        self._carry = pcm[usable:]
+        samples = np.frombuffer(pcm[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        self._pending = np.concatenate([self._pending, samples])
+        self._since_vad += len(samples)
+        self._total += len(samples)
+        if self._total >= SAMPLE_RATE * MAX_UTTERANCE_S:
+            # Leave the pending audio for finish() to decode
+            self.ended = True
+            return []
+        if self._since_vad < _ms_to_samples(VAD_STEP_MS):
+            return []
+        self._since_vad = 0
+        return self._decode_closed_segments()
+
+    def finish(self) -> str:
+        """Decode whatever audio is left and return the full transcript."""
+        if len(self._pending) >= _ms_to_samples(VAD_STEP_MS):
+            piece = transcribe_array(self._pending, vad_filter=True, initial_prompt=self.text)
+            if piece:
+                self._parts.append(piece)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.ended = True
+        return self.text
+
+    def _decode_closed_segments(self) -> list[str]:
+        speech = get_speech_timestamps(self._pending, VAD_OPTIONS, sampling_rate=SAMPLE_RATE)
+        closed_before = len(self._pending) - _ms_to_samples(SEGMENT_SILENCE_MS)
+        closed = [s for s in speech if s["end"] <= closed_before]
+
+        new_parts = []
+        if closed:
+            start, end = closed[0]["start"], closed[-1]["end"]
+            piece = transcribe_array(self._pending[start:end], initial_prompt=self.text)
+            if piece:
+                self._parts.append(piece)
+                new_parts.append(piece)
+            self._pending = self._pending[end:]
+            speech = speech[len(closed):]
+
+        if self._parts and not speech and len(self._pending) >= _ms_to_samples(END_OF_UTTERANCE_MS):
+            # Only trailing silence is left, so finish() has nothing to decode
+            self._pending = np.zeros(0, dtype=np.float32)
+            self.ended = True
+        elif not self._parts and not speech:
+            # Drop leading silence before the first segment; the length cap starts after it
+            keep = _ms_to_samples(SEGMENT_SILENCE_MS)
+            self._pending = self._pending[-keep:]
+            self._total = len(self._pending)
+        return new_parts
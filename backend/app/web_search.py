@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import fcntl
+import tempfile
+import threading
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FILE = os.path.join(os.path.dirname(__file__), "web_search_cache.json")
+LOCK_FILE = CACHE_FILE + ".lock"
+FRESH_TTL = 60 * 60            # serve without refreshing
+MAX_AGE = 24 * 60 * 60         # serve stale + refresh in background until this age
+MAX_RESULTS = 2
+SNIPPET_CHARS = 300
+
+_backend = None
+_cache = {}
+_lock = threading.Lock()          # guards in-memory state only, never held over disk I/O
+_write_lock = threading.Lock()    # serializes this process's cache file writes
+_refreshing = set()
+_inflight = {}
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class LocalSearch:
+    """Offline stand-in for Tavily with the same invoke() shape."""
+
+    def invoke(self, payload: dict) -> dict:
+        query = payload["query"]
+        return {
+            "query": query,
+            "results": [
+                {
+                    "title": f"Local result for '{query}'",
+                    "url": "http://localhost/search?q=" + query.replace(" ", "+"),
+                    "content": f"Offline placeholder content for '{query}'.",
+                }
+            ],
+        }
+
+
+def setup_web_search():
+    """Pick the search backend (WEB_SEARCH_BACKEND=local for offline) and load the cache."""
+    global _backend, _cache
+
+    if os.getenv("WEB_SEARCH_BACKEND") == "local":
+        _backend = LocalSearch()
+    else:
+        from langchain_tavily import TavilySearch
+        _backend = TavilySearch(max_results=MAX_RESULTS)
+
+    _cache = _load_disk_cache()
+
+
+# ---------------------------------------------------------------------------
+# Cache helpers
+# ---------------------------------------------------------------------------
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _compact(results: list) -> list:
+    return [
+        {
+            "title": r.get("title", ""),
+            "url": r.get("url", ""),
+            "snippet": (r.get("content") or "")[:SNIPPET_CHARS],
+        }
+        for r in results[:MAX_RESULTS]
+    ]
+
+
+def _load_disk_cache() -> dict:
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        logger.warning("Web search cache unreadable, ignoring it")
+        return {}
+
+
+def _save_cache() -> None:
+    """Merge with the on-disk cache and replace it atomically.
+
+    Other workers write the same file, so the read-merge-write runs under an
+    interprocess file lock and no worker drops another's entries.
+    """
+    with _lock:
+        snapshot = dict(_cache)
+
+    try:
+        with _write_lock, open(LOCK_FILE, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            for key, entry in _load_disk_cache().items():
+                if key not in snapshot or entry["fetched_at"] > snapshot[key]["fetched_at"]:
+                    snapshot[key] = entry
+
+            cutoff = time.time() - MAX_AGE
+            snapshot = {k: v for k, v in snapshot.items() if v["fetched_at"] >= cutoff}
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE), suffix=".tmp")
+            try:
+                with open(fd, "w") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, CACHE_FILE)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+    except OSError as e:
+        logger.warning(f"Could not write web search cache: {e}")
+        return
+
+    # Pick up entries other workers fetched
+    with _lock:
+        for key, entry in snapshot.items():
+            if key not in _cache or entry["fetched_at"] > _cache[key]["fetched_at"]:
+                _cache[key] = entry
+
+
+def _fetch(key: str) -> list:
+    res = _backend.invoke({"query": key})
+    results = _compact(res.get("results", []))
+    with _lock:
+        _cache[key] = {"fetched_at": time.time(), "results": results}
+    _save_cache()
+    return results
+
+
+def _refresh_in_background(key: str) -> None:
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _fetch(key)
+        except Exception as e:
+            logger.error(f"Web search refresh failed for '{key}': {e}")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+# ---------------------------------------------------------------------------
+# Public entry point
+# ---------------------------------------------------------------------------
+
+
+def search(query: str) -> list:
+    """Cached web search returning compact title/url/snippet results."""
+    key = _normalize(query)
+    with _lock:
+        entry = _cache.get(key)
+
+    if entry:
+        age = time.time() - entry["fetched_at"]
+        if age < FRESH_TTL:
+            return entry["results"]
+        if age < MAX_AGE:
+            _refresh_in_background(key)
+            return entry["results"]
+
+    # Concurrent misses for the same query share one backend call and its outcome
+    with _lock:
+        call = _inflight.get(key)
+        owner = call is None
+        if owner:
+            call = _inflight[key] = {"done": threading.Event(), "results": None, "error": None}
+
+    if not owner:
+        call["done"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["results"]
+
+    try:
+        call["results"] = _fetch(key)
+        return call["results"]
+    except Exception as e:
+        call["error"] = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        call["done"].set()